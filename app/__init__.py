@@ -5,12 +5,15 @@ This module creates and configures the Flask application instance.
 """
 
 from flask import Flask
+from flask_orjson import OrjsonProvider
 from flask_sqlalchemy import SQLAlchemy
 from dotenv import load_dotenv
 
 load_dotenv()
 
-db = SQLAlchemy()
+# Keep attributes loaded after commit so building a response from a just
+# written object doesn't trigger a follow-up SELECT to refresh it.
+db = SQLAlchemy(session_options={"expire_on_commit": False})
 
 
 def create_app(config_class):
@@ -20,6 +23,9 @@ def create_app(config_class):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Serialize JSON responses with orjson instead of the stdlib json module
+    app.json = OrjsonProvider(app)
+
     # Initialize SQLAlchemy with the app
     db.init_app(app)
 
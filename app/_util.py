@@ -0,0 +1,23 @@
+"""
+Small helpers shared by the HTML and API blueprints.
+"""
+
+from http import HTTPStatus
+
+from flask import abort
+
+from . import db
+from .models import Bank
+
+
+def get_bank_or_404(bank_id: int, description: str | None = None) -> Bank:
+    """
+    Return the bank with the given id, or abort with 404 if it doesn't exist.
+
+    Session.get checks the identity map first and otherwise issues a
+    primary-key SELECT. The optional description becomes the 404 message.
+    """
+    bank: Bank | None = db.session.get(Bank, bank_id)
+    if bank is None:
+        abort(HTTPStatus.NOT_FOUND, description=description)
+    return bank
@@ -4,30 +4,46 @@ REST API endpoints for Bank resources.
 These endpoints return JSON.
 """
 
-from flask import Blueprint, jsonify, request, current_app
+import math
+
+import orjson
+from flask import Blueprint, Response, abort, jsonify, request, current_app
 from http import HTTPStatus
 from werkzeug.exceptions import HTTPException
-from sqlalchemy import func
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
 
 from . import db
+from ._util import get_bank_or_404
 from .models import Bank
 
 api_bp = Blueprint("api", __name__)
 
 """
-Error Handlers (JSON only for API blueprint) are defined below.
+Error Handlers (JSON only for API routes) are defined below.
 """
 
 
 @api_bp.errorhandler(HTTPException)
-def handle_http_exception(e: HTTPException) -> tuple[dict, int]:
+@api_bp.app_errorhandler(HTTPException)
+def handle_http_exception(e: HTTPException) -> tuple[dict, int] | HTTPException:
     """
     Handle HTTP errors (404, 400, 403, etc.) for API routes.
 
     Flask / Werkzeug raises HTTPException for typical HTTP errors.
     By default, Flask renders an HTML error page. For API routes
     we want to return a JSON payload instead.
+
+    It is also registered app-wide so routing errors under /api/ (unknown
+    URL, wrong method), which never reach the blueprint, get JSON too.
+    The blueprint registration is still needed because blueprint handlers,
+    including the catch-all below, take precedence over app handlers.
+    Other paths return the exception unchanged and keep Flask's default
+    HTML page.
     """
+    if not request.path.startswith("/api/"):
+        return e
+
     response = {
         "error": e.name,
         "message": e.description,
@@ -43,8 +59,9 @@ def handle_unexpected_exception(e: Exception) -> tuple[dict, int]:
     This prevents exposing internal errors to the client.
     We log the error and return a generic JSON 500 response.
     """
-    # Log full stack trace in the app logger for debugging
-    current_app.logger.exception(f"Unhandled exception in API: {e}")
+    # Log full stack trace in the app logger for debugging. Lazy %-style
+    # arguments are only formatted if the record is actually emitted.
+    current_app.logger.exception("Unhandled exception in API: %s", e)
 
     response = {
         "error": "Internal Server Error",
@@ -53,18 +70,45 @@ def handle_unexpected_exception(e: Exception) -> tuple[dict, int]:
     return jsonify(response), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+def _json_response(payload: dict, status: int = HTTPStatus.OK) -> Response:
+    """
+    Encode a payload straight to a JSON response with orjson.
+
+    Used on the list endpoint, the hottest read path, to skip jsonify and
+    the JSON provider layer; orjson already returns the UTF-8 bytes
+    the response body needs.
+
+    The response carries an ETag of the encoded body, and a request whose
+    If-None-Match matches gets an empty 304 Not Modified. Hashing the body
+    rather than a MAX(id)/COUNT(*) stamp keeps renames of existing banks
+    from being served as unchanged.
+    """
+    response = Response(
+        orjson.dumps(payload), status=status, mimetype="application/json"
+    )
+    response.add_etag()
+    return response.make_conditional(request)
+
+
 """
 API endpoints below.
 """
 
 
 @api_bp.route("/banks", methods=["GET"])
-def get_bank_list() -> tuple[dict, int]:
+def get_bank_list() -> Response:
     """
     GET /api/banks
 
     Return a JSON list of all banks with pagination.
+
+    Pass 'after_id' (and optionally 'limit') for keyset pagination, which
+    seeks past the last id the client has seen. Otherwise 'page' and
+    'per_page' select an offset-based page.
     """
+    if "after_id" in request.args:
+        return _get_bank_list_keyset()
+
     page: int = request.args.get("page", 1, type=int)
     per_page: int = request.args.get("per_page", 5, type=int)
 
@@ -77,27 +121,92 @@ def get_bank_list() -> tuple[dict, int]:
     if per_page > 100:
         per_page = 100
 
-    pagination = Bank.query.order_by(Bank.id).paginate(
-        page=page,
-        per_page=per_page,
-        error_out=False,
+    # Select plain column rows with Core instead of loading ORM objects
+    # and calling to_dict() on each of them. COUNT(*) OVER () returns the
+    # total alongside every row, so one round-trip serves rows and total.
+    rows = db.session.execute(
+        select(
+            Bank.id,
+            Bank.name,
+            Bank.location,
+            func.count().over().label("total"),
+        )
+        .order_by(Bank.id)
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).all()
+
+    if rows:
+        total: int = rows[0].total
+    elif page > 1:
+        # A page past the end has no rows to carry the total
+        total = db.session.scalar(select(func.count()).select_from(Bank))
+    else:
+        total = 0
+
+    total_pages: int = math.ceil(total / per_page)
+    has_next: bool = page < total_pages
+    has_prev: bool = page > 1
+
+    return _json_response(
+        {
+            "data": [
+                {"id": row.id, "name": row.name, "location": row.location}
+                for row in rows
+            ],
+            "pagination": {
+                "page": page,
+                "per_page": per_page,
+                "total": total,
+                "total_pages": total_pages,
+                "has_next": has_next,
+                "has_prev": has_prev,
+                "next_page": page + 1 if has_next else None,
+                "prev_page": page - 1 if has_prev else None,
+            },
+        }
     )
 
-    return jsonify(
+
+def _get_bank_list_keyset() -> Response:
+    """
+    Keyset (cursor) pagination for GET /api/banks?after_id=<id>.
+
+    WHERE id > after_id ORDER BY id is an index seek on the primary key,
+    so deep pages cost the same as the first one and no COUNT is needed.
+    """
+    after_id: int = request.args.get("after_id", 0, type=int)
+    limit: int = request.args.get("limit", 10, type=int)
+
+    if limit < 1:
+        limit = 10
+    if limit > 100:
+        limit = 100
+
+    # Fetch one extra row to know whether another page follows
+    rows = (
+        db.session.execute(
+            select(Bank.id, Bank.name, Bank.location)
+            .where(Bank.id > after_id)
+            .order_by(Bank.id)
+            .limit(limit + 1)
+        )
+        .mappings()
+        .all()
+    )
+    has_next: bool = len(rows) > limit
+    rows = rows[:limit]
+
+    return _json_response(
         {
-            "data": [bank.to_dict() for bank in pagination.items],
+            "data": [dict(row) for row in rows],
             "pagination": {
-                "page": pagination.page,
-                "per_page": pagination.per_page,
-                "total": pagination.total,
-                "total_pages": pagination.pages,
-                "has_next": pagination.has_next,
-                "has_prev": pagination.has_prev,
-                "next_page": pagination.next_num,
-                "prev_page": pagination.prev_num,
+                "limit": limit,
+                "next_cursor": rows[-1]["id"] if has_next else None,
+                "has_next": has_next,
             },
         }
-    ), HTTPStatus.OK
+    )
 
 
 @api_bp.route("/banks", methods=["POST"])
@@ -120,11 +229,15 @@ def create_bank():
     if not name or not location:
         return jsonify(error_response), HTTPStatus.BAD_REQUEST
 
-    # Check if another bank with the same name and location already exists
-    if Bank.query.filter(
-        func.lower(Bank.name) == func.lower(name),
-        func.lower(Bank.location) == func.lower(location),
-    ).first():
+    bank: Bank = Bank(name=name, location=location)
+    db.session.add(bank)
+
+    # The unique constraint on the lower-cased name and location rejects
+    # a bank that already exists with the same name and location
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
         return jsonify(
             {
                 "error": "Existing bank",
@@ -132,11 +245,10 @@ def create_bank():
             }
         ), HTTPStatus.BAD_REQUEST
 
-    bank: Bank = Bank(name=name, location=location)
-    db.session.add(bank)
-    db.session.commit()
-
-    return jsonify(bank.to_dict()), HTTPStatus.CREATED
+    # Only the id comes back from the INSERT; the rest is what we just wrote
+    return jsonify(
+        {"id": bank.id, "name": name, "location": location}
+    ), HTTPStatus.CREATED
 
 
 @api_bp.route("/banks/<int:bank_id>", methods=["GET"])
@@ -146,8 +258,8 @@ def get_bank_details(bank_id: int) -> tuple[dict, int]:
 
     Return JSON for a single bank or 404 if not found.
     """
-    bank: Bank = db.get_or_404(
-        Bank, bank_id, description=f"Bank with id {bank_id} not found"
+    bank: Bank = get_bank_or_404(
+        bank_id, description=f"Bank with id {bank_id} not found"
     )
     return jsonify(bank.to_dict()), HTTPStatus.OK
 
@@ -159,9 +271,6 @@ def update_bank(bank_id):
 
     Update an existing bank. Expects JSON with 'name' and/or 'location'.
     """
-    bank: Bank = db.get_or_404(
-        Bank, bank_id, description=f"Bank with id {bank_id} not found"
-    )
     data: dict = request.get_json() or {}
 
     name: str | None = data.get("name")
@@ -178,12 +287,28 @@ def update_bank(bank_id):
             HTTPStatus.BAD_REQUEST,
         )
 
-    # Check if another bank with the same name and location already exists except the current bank
-    if Bank.query.filter(
-        Bank.id != bank_id,
-        func.lower(Bank.name) == func.lower(name),
-        func.lower(Bank.location) == func.lower(location),
-    ).first():
+    values: dict = {}
+    if name:
+        values["name"] = name
+    if location:
+        values["location"] = location
+
+    # A single UPDATE ... RETURNING applies the change and returns the row,
+    # so there is no separate SELECT to load the bank first. The unique
+    # constraint rejects a collision with another bank.
+    try:
+        row = (
+            db.session.execute(
+                update(Bank)
+                .where(Bank.id == bank_id)
+                .values(**values)
+                .returning(Bank.id, Bank.name, Bank.location)
+            )
+            .mappings()
+            .first()
+        )
+    except IntegrityError:
+        db.session.rollback()
         return jsonify(
             {
                 "error": "Existing bank",
@@ -191,14 +316,12 @@ def update_bank(bank_id):
             }
         ), HTTPStatus.BAD_REQUEST
 
-    if name:
-        bank.name = name
-    if location:
-        bank.location = location
+    if row is None:
+        abort(HTTPStatus.NOT_FOUND, description=f"Bank with id {bank_id} not found")
 
     db.session.commit()
 
-    return jsonify(bank.to_dict()), HTTPStatus.OK
+    return jsonify(dict(row)), HTTPStatus.OK
 
 
 @api_bp.route("/banks/<int:bank_id>", methods=["DELETE"])
@@ -208,10 +331,11 @@ def delete_bank(bank_id: int) -> tuple[str, int]:
 
     Delete an existing bank.
     """
-    bank: Bank = db.get_or_404(
-        Bank, bank_id, description=f"Bank with id {bank_id} not found"
-    )
-    db.session.delete(bank)
+    # Delete in a single statement; no affected rows means the bank is missing
+    result = db.session.execute(delete(Bank).where(Bank.id == bank_id))
+    if result.rowcount == 0:
+        abort(HTTPStatus.NOT_FOUND, description=f"Bank with id {bank_id} not found")
+
     db.session.commit()
     # 204 No Content indicates success with no response body
     return "", HTTPStatus.NO_CONTENT
@@ -8,6 +8,8 @@ so that the application factory can easily switch configurations.
 import os
 import urllib.parse
 
+from sqlalchemy.pool import StaticPool
+
 
 class BaseConfig:
     """Base configuration shared by all environments."""
@@ -37,6 +39,19 @@ class DevelopmentConfig(BaseConfig):
         "?driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes"
     )
 
+    # Connection pool sized for concurrent workers. Pre-ping drops dead
+    # connections and recycling avoids server-side idle timeouts.
+    # fast_executemany is the pyodbc parameter-array mode for batch inserts.
+    # These live here rather than in BaseConfig because SQLite's in-memory
+    # StaticPool used by tests rejects the pool sizing arguments.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "25")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "25")),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "fast_executemany": True,
+    }
+
 
 class TestingConfig(BaseConfig):
     """
@@ -47,3 +62,10 @@ class TestingConfig(BaseConfig):
 
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+
+    # Share one in-memory connection across every session and thread, so
+    # all tests see the same database and commits never touch the disk.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {"check_same_thread": False},
+        "poolclass": StaticPool,
+    }
@@ -2,6 +2,8 @@
 Database models for the application.
 """
 
+from sqlalchemy import Computed
+
 from . import db
 
 
@@ -13,13 +15,25 @@ class Bank(db.Model):
         id       - Integer primary key
         name     - Name of the bank
         location - Location of the bank
+
+    The lower-cased computed columns back a unique constraint so the
+    database itself rejects case-insensitive duplicates of name + location.
     """
 
     __tablename__ = "banks"
+    __table_args__ = (
+        db.UniqueConstraint("name_lc", "location_lc", name="uq_bank_lc"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True)
     name: str = db.Column(db.String(255), nullable=False)
     location: str = db.Column(db.String(255), nullable=False)
+    name_lc: str = db.Column(
+        db.String(255), Computed("LOWER(name)", persisted=True)
+    )
+    location_lc: str = db.Column(
+        db.String(255), Computed("LOWER(location)", persisted=True)
+    )
 
     def to_dict(self) -> dict:
         """
@@ -32,4 +46,4 @@ class Bank(db.Model):
         }
 
     def __repr__(self) -> str:
-        return f"<Bank id={self.id} name={self.name!r} location={self.location!r}>"
\ No newline at end of file
+        return f"<Bank id={self.id} name={self.name!r} location={self.location!r}>"
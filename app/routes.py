@@ -13,15 +13,41 @@ from flask import (
     url_for,
     flash,
 )
-from sqlalchemy import func
+from sqlalchemy import func, literal, select
+from sqlalchemy.exc import IntegrityError
 
 from . import db
+from ._util import get_bank_or_404
 from .models import Bank
 
 # Blueprint for bank-related pages
 bank_bp = Blueprint("bank", __name__)
 
 
+def _bank_exists(name: str, location: str, exclude_id: int | None = None) -> bool:
+    """
+    Return True if a bank with this name and location exists (case-insensitively).
+
+    Runs SELECT 1 ... LIMIT 1 (TOP 1 on SQL Server) against the lower-cased
+    computed columns, so no ORM object is built. The arguments go through
+    the same SQL LOWER() as the columns; Python's str.lower() folds
+    non-ASCII letters differently (SQLite's LOWER() only handles ASCII).
+    The uq_bank_lc constraint still has the final say on a race.
+
+    :param exclude_id: ID of a bank to ignore, e.g. the one being edited
+    """
+    # Only the bound parameters are lowered: the computed columns stay bare,
+    # so the predicate can still seek on uq_bank_lc, and LOWER(?) keeps the
+    # statement text fixed, so its cached plan is reused
+    stmt = select(literal(1)).where(
+        Bank.name_lc == func.lower(name),
+        Bank.location_lc == func.lower(location),
+    )
+    if exclude_id is not None:
+        stmt = stmt.where(Bank.id != exclude_id)
+    return db.session.execute(stmt.limit(1)).scalar() is not None
+
+
 @bank_bp.route("/")
 def home():
     """
@@ -65,7 +91,7 @@ def get_bank_detail(bank_id):
 
     :param bank_id: ID of the bank to display
     """
-    bank = db.get_or_404(Bank, bank_id)
+    bank = get_bank_or_404(bank_id)
     return render_template("bank_detail.html", bank=bank)
 
 
@@ -87,16 +113,21 @@ def create_bank():
             return render_template("bank_form.html", mode="create")
 
         # Check if another bank with the same name and location already exists
-        if Bank.query.filter(
-            func.lower(Bank.name) == func.lower(name),
-            func.lower(Bank.location) == func.lower(location),
-        ).first():
+        if _bank_exists(name, location):
             flash("Another bank with this name and location already exists.", "error")
             return render_template("bank_form.html", mode="create")
 
         new_bank: Bank = Bank(name=name, location=location)
         db.session.add(new_bank)
-        db.session.commit()
+
+        # The pre-check above can miss a duplicate (a concurrent insert),
+        # so the unique constraint has the final say
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            flash("Another bank with this name and location already exists.", "error")
+            return render_template("bank_form.html", mode="create")
         flash("Bank created successfully!", "success")
         return redirect(url_for("bank.get_bank_list"))
 
@@ -112,7 +143,7 @@ def update_bank(bank_id):
     - GET: render the form pre-filled with existing data.
     - POST: apply updates and save to the database.
     """
-    bank: Bank = db.get_or_404(Bank, bank_id)
+    bank: Bank = get_bank_or_404(bank_id)
 
     if request.method == "POST":
         name: str | None = request.form.get("name")
@@ -123,17 +154,19 @@ def update_bank(bank_id):
             return render_template("bank_form.html", mode="edit", bank=bank)
 
         # Check if another bank with the same name and location already exists except the current bank
-        if Bank.query.filter(
-            Bank.id != bank_id,
-            func.lower(Bank.name) == func.lower(name),
-            func.lower(Bank.location) == func.lower(location),
-        ).first():
+        if _bank_exists(name, location, exclude_id=bank_id):
             flash("Another bank with this name and location already exists.", "error")
             return render_template("bank_form.html", mode="edit", bank=bank)
 
         bank.name = name
         bank.location = location
-        db.session.commit()
+
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            flash("Another bank with this name and location already exists.", "error")
+            return render_template("bank_form.html", mode="edit", bank=bank)
 
         flash("Bank updated successfully!", "success")
         return redirect(url_for("bank.get_bank_detail", bank_id=bank.id))
@@ -153,7 +186,7 @@ def delete_bank(bank_id: int) -> str:
     Using POST for deletion is safer than using GET, because GET requests
     should not have side effects.
     """
-    bank = db.get_or_404(Bank, bank_id)
+    bank = get_bank_or_404(bank_id)
 
     if request.method == "POST":
         db.session.delete(bank)
@@ -13,6 +13,9 @@ import requests
 
 BASE_URL = "http://127.0.0.1:5001/api/banks"
 
+# One session for all calls so the HTTP connection is kept alive and reused
+SESSION = requests.Session()
+
 
 def handle_response(resp):
     try:
@@ -33,7 +36,7 @@ def handle_response(resp):
 
 def list_banks():
     """GET /api/banks"""
-    resp = requests.get(BASE_URL)
+    resp = SESSION.get(BASE_URL)
     print("\nLIST BANKS:")
     handle_response(resp)
 
@@ -41,7 +44,7 @@ def list_banks():
 def create_bank(name, location):
     """POST /api/banks"""
     payload = {"name": name, "location": location}
-    resp = requests.post(BASE_URL, json=payload)
+    resp = SESSION.post(BASE_URL, json=payload)
     print("\nCREATE BANK:")
     handle_response(resp)
     if resp.ok:
@@ -51,7 +54,7 @@ def create_bank(name, location):
 
 def get_bank(bank_id):
     """GET /api/banks/<id>"""
-    resp = requests.get(f"{BASE_URL}/{bank_id}")
+    resp = SESSION.get(f"{BASE_URL}/{bank_id}")
     print("\nGET BANK:")
     handle_response(resp)
     if resp.ok:
@@ -66,14 +69,14 @@ def update_bank(bank_id, name=None, location=None):
         payload["name"] = name
     if location is not None:
         payload["location"] = location
-    resp = requests.put(f"{BASE_URL}/{bank_id}", json=payload)
+    resp = SESSION.put(f"{BASE_URL}/{bank_id}", json=payload)
     print("\nUPDATE BANK:")
     handle_response(resp)
 
 
 def delete_bank(bank_id):
     """DELETE /api/banks/<id>"""
-    resp = requests.delete(f"{BASE_URL}/{bank_id}")
+    resp = SESSION.delete(f"{BASE_URL}/{bank_id}")
     print("\nDELETE BANK:")
     handle_response(resp)
 
@@ -22,6 +22,22 @@ def conn_str(database):
     )
 
 
+def bulk_insert_banks(rows: list[tuple[str, str]]) -> None:
+    """
+    Insert many (name, location) rows into dbo.banks in one batch.
+
+    fast_executemany sends all parameter sets to SQL Server as a single
+    array instead of one round-trip per row.
+    """
+    with pyodbc.connect(conn_str(DB_NAME)) as conn:
+        with conn.cursor() as cursor:
+            cursor.fast_executemany = True
+            cursor.executemany(
+                "INSERT INTO dbo.banks (name, location) VALUES (?, ?)", rows
+            )
+        conn.commit()
+
+
 # 1. Create database if it doesn't exist
 CREATE_DB_SQL = f"""
 IF DB_ID('{DB_NAME}') IS NULL
@@ -30,11 +46,6 @@ BEGIN
 END;
 """
 
-with pyodbc.connect(conn_str("master"), autocommit=True) as conn:
-    with conn.cursor() as cursor:
-        cursor.execute(CREATE_DB_SQL)
-        print(f"Ensured database '{DB_NAME}' exists.")
-
 # 2. Create table if it doesn't exist
 CREATE_TABLE_SQL = """
 IF OBJECT_ID('dbo.banks', 'U') IS NULL
@@ -47,9 +58,41 @@ BEGIN
 END;
 """
 
-with pyodbc.connect(conn_str(DB_NAME), autocommit=True) as conn:
-    with conn.cursor() as cursor:
-        cursor.execute(CREATE_TABLE_SQL)
-        print("Ensured table 'dbo.banks' exists.")
+# 3. Add lower-cased computed columns and their unique constraint if missing.
+# Each statement runs in its own batch so the constraint can reference the
+# columns added just before it.
+MIGRATE_LC_SQL = [
+    """
+    IF COL_LENGTH('dbo.banks', 'name_lc') IS NULL
+        ALTER TABLE dbo.banks ADD name_lc AS LOWER(name) PERSISTED;
+    """,
+    """
+    IF COL_LENGTH('dbo.banks', 'location_lc') IS NULL
+        ALTER TABLE dbo.banks ADD location_lc AS LOWER(location) PERSISTED;
+    """,
+    """
+    IF OBJECT_ID('dbo.uq_bank_lc', 'UQ') IS NULL
+        ALTER TABLE dbo.banks
+            ADD CONSTRAINT uq_bank_lc UNIQUE (name_lc, location_lc);
+    """,
+]
+
+
+if __name__ == "__main__":
+    with pyodbc.connect(conn_str("master"), autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_DB_SQL)
+            print(f"Ensured database '{DB_NAME}' exists.")
+
+    with pyodbc.connect(conn_str(DB_NAME), autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_SQL)
+            print("Ensured table 'dbo.banks' exists.")
+
+    with pyodbc.connect(conn_str(DB_NAME), autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            for statement in MIGRATE_LC_SQL:
+                cursor.execute(statement)
+            print("Ensured unique constraint 'uq_bank_lc' exists.")
 
-print("Script finished.")
+    print("Script finished.")
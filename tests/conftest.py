@@ -14,32 +14,116 @@ if ROOT_DIR not in sys.path:
 
 from app import create_app, db  # noqa: E402
 from app.config import TestingConfig  # noqa: E402
+from app.models import Bank  # noqa: E402
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
     """
-    Create and configure a new app instance for each test session.
+    Create and configure a single app instance for the whole test session.
 
     We use the TestingConfig which points to an in-memory SQLite DB.
+    Building the app and its engine once is much cheaper than once per
+    test; the `_reset_db` fixture below keeps tests isolated instead.
+    Under pytest-xdist each worker process builds its own app, so every
+    worker gets a private in-memory database.
     """
     app = create_app(TestingConfig)
 
-    # Create tables before tests
+    # Create tables once before the tests
     with app.app_context():
         db.create_all()
 
     yield app
 
-    # Drop everything after tests
+    # Drop everything after the test session
     with app.app_context():
         db.session.remove()
         db.drop_all()
 
 
-@pytest.fixture
+@pytest.fixture(autouse=True)
+def _reset_db(app):
+    """
+    Empty every table after each test so no rows leak into the next one.
+
+    Deleting rows is far cheaper than dropping and recreating the schema.
+    """
+    yield
+
+    with app.app_context():
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+
+
+@pytest.fixture(scope="session")
+def seed_banks(app):
+    """
+    Return a helper that inserts `n` banks named "Bank 1".."Bank n"
+    located in "City 1".."City n".
+
+    Rows go in through a Core executemany on the banks table, which
+    bypasses the ORM entirely: no Bank objects, attribute instrumentation,
+    events or identity map.
+    """
+
+    def _seed_banks(n: int) -> None:
+        with app.app_context():
+            db.session.execute(
+                Bank.__table__.insert(),
+                [
+                    {"name": f"Bank {i}", "location": f"City {i}"}
+                    for i in range(1, n + 1)
+                ],
+            )
+            db.session.commit()
+
+    return _seed_banks
+
+
+@pytest.fixture(scope="session")
 def client(app):
     """
     Flask test client for making HTTP requests in tests.
+
+    One client is shared by the whole session. It is deliberately not
+    entered as a context manager: that would keep the last request context
+    pushed between tests, so every later request and test body would share
+    its session instead of getting a fresh one.
     """
     return app.test_client()
+
+
+@pytest.fixture(autouse=True)
+def _reset_cookies(app, client):
+    """
+    Drop the session cookie after each test so flashed messages or other
+    session state never carry over through the shared client.
+    """
+    yield
+    client.delete_cookie(app.config["SESSION_COOKIE_NAME"])
+
+
+@pytest.fixture(scope="session")
+def empty_responses(client):
+    """
+    Fetch the HTML and JSON bank lists once while no banks exist.
+
+    `_warmup` requests this before the first test, while the database is
+    still empty. Both test modules then share the two cached responses
+    instead of each dispatching its own request.
+    """
+    return {"html": client.get("/banks"), "json": client.get("/api/banks")}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(empty_responses):
+    """
+    Send the first requests of the session before any test runs.
+
+    The first request pays one-time costs (URL map binding, Jinja
+    environment and template compilation, the first DB connection).
+    Fetching `empty_responses` here keeps that cold start out of whichever
+    test happens to run first, and the responses are reused anyway.
+    """
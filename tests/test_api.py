@@ -4,35 +4,57 @@ Tests for the REST API endpoints.
 This covers:
 - empty bank list
 - bank list with pagination
+- bank list page past the end
+- bank list with keyset (cursor) pagination
+- bank list ETag / 304 Not Modified
 - creating a bank
+- a created bank is persisted
+- creating a bank emits no SELECT after commit
 - bank details
 - updating a bank
 - deleting a bank
 - create duplicate bank
 - update duplicate bank
 - update same bank
+- partial update colliding with another bank
+- JSON errors for unknown API routes
+- updating / deleting a missing bank
 - test 400 error (custom error handler)
 - test missing fields on create bank
 
 """
 
+import pytest
+from sqlalchemy import event
+
 from app import db
 from app.models import Bank
 
+# Request bodies shared by several tests. The test client only reads the
+# json= argument, so sharing one dict between requests is safe.
+CREATE_PAYLOAD = {"name": "API Test Bank", "location": "Dhaka"}
+UPDATE_PAYLOAD = {"location": "New City"}
+# Differs only in case from the seeded "Dup Bank" in "Dhaka"
+DUPLICATE_PAYLOAD = {"name": "dup bank", "location": "dhaka"}
+
 
-def test_api_get_bank_list_empty(client):
+def test_api_get_bank_list_empty(empty_responses):
     """
-    When there are no banks, the API should return an empty list
-    and valid pagination metadata.
+    When there are no banks, the API should return an empty list.
     """
-    response = client.get("/api/banks")
+    response = empty_responses["json"]
     assert response.status_code == 200
 
     data = response.get_json()
     assert "data" in data
     assert data["data"] == []
 
-    pagination = data["pagination"]
+
+def test_api_get_bank_list_empty_pagination(empty_responses):
+    """
+    When there are no banks, the pagination metadata should still be valid.
+    """
+    pagination = empty_responses["json"].get_json()["pagination"]
     assert pagination["total"] == 0
     assert pagination["total_pages"] == 0
     assert pagination["page"] == 1
@@ -40,17 +62,14 @@ def test_api_get_bank_list_empty(client):
     assert pagination["has_next"] is False
 
 
-def test_api_get_bank_list_pagination_multiple_pages(client, app):
+def test_api_get_bank_list_pagination_multiple_pages(client, seed_banks):
     """
     Test that the API returns correct pagination metadata and items
     when there are multiple pages.
 
     per_page = 5 (as in api_list_banks).
     """
-    with app.app_context():
-        for i in range(1, 13):  # 12 banks
-            db.session.add(Bank(name=f"Bank {i}", location=f"City {i}"))
-        db.session.commit()
+    seed_banks(12)
 
     # Request page 2 with per_page=5
     response = client.get("/api/banks?page=2&per_page=5")
@@ -76,21 +95,135 @@ def test_api_get_bank_list_pagination_multiple_pages(client, app):
     assert pagination["prev_page"] == 1
 
 
-def test_api_create_bank(client, app):
+def test_api_get_bank_list_page_past_end(client, seed_banks):
+    """
+    A page beyond the last one should return no items but still report
+    the real total.
+    """
+    seed_banks(3)
+
+    response = client.get("/api/banks?page=5&per_page=2")
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert data["data"] == []
+    assert data["pagination"]["total"] == 3
+    assert data["pagination"]["total_pages"] == 2
+    assert data["pagination"]["has_next"] is False
+    assert data["pagination"]["prev_page"] == 4
+
+
+def test_api_get_bank_list_keyset_pagination(client, seed_banks):
+    """
+    Test that after_id/limit walks the list with a cursor and stops
+    reporting a next cursor on the last page.
+    """
+    seed_banks(12)
+
+    response = client.get("/api/banks?after_id=0&limit=5")
+    assert response.status_code == 200
+    data = response.get_json()
+
+    assert [bank["name"] for bank in data["data"]] == [
+        f"Bank {i}" for i in range(1, 6)
+    ]
+    assert data["pagination"]["limit"] == 5
+    assert data["pagination"]["has_next"] is True
+    next_cursor = data["pagination"]["next_cursor"]
+    assert next_cursor == data["data"][-1]["id"]
+
+    # Follow the cursor through page 2 to the last page
+    response = client.get(f"/api/banks?after_id={next_cursor}&limit=5")
+    data = response.get_json()
+    assert data["data"][0]["name"] == "Bank 6"
+
+    next_cursor = data["pagination"]["next_cursor"]
+    response = client.get(f"/api/banks?after_id={next_cursor}&limit=5")
+    data = response.get_json()
+
+    assert [bank["name"] for bank in data["data"]] == ["Bank 11", "Bank 12"]
+    assert data["pagination"]["has_next"] is False
+    assert data["pagination"]["next_cursor"] is None
+
+
+def test_api_get_bank_list_etag(client, app):
+    """
+    The list response carries an ETag; sending it back yields 304 until
+    the listed data changes.
+    """
+    with app.app_context():
+        bank = Bank(name="Bank 1", location="Dhaka")
+        db.session.add(bank)
+        db.session.commit()
+        bank_id = bank.id
+
+    response = client.get("/api/banks")
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/banks", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    # Renaming a bank changes the page, so the old ETag no longer matches
+    client.patch(f"/api/banks/{bank_id}", json={"name": "Bank One"})
+    response = client.get("/api/banks", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["data"][0]["name"] == "Bank One"
+
+
+def test_api_create_bank(client):
     """
     Test creating a bank through the API.
     """
-    payload = {"name": "API Test Bank", "location": "Dhaka"}
-    response = client.post("/api/banks", json=payload)
+    response = client.post("/api/banks", json=CREATE_PAYLOAD)
     assert response.status_code == 201
 
     data = response.get_json()
     assert data["name"] == "API Test Bank"
     assert data["location"] == "Dhaka"
 
+
+def test_bank_persisted_across_request(client, app):
+    """
+    A bank created through the API should be stored in the database.
+
+    This is the one test that checks the database directly; the others
+    read changes back through follow-up requests.
+    """
+    response = client.post("/api/banks", json=CREATE_PAYLOAD)
+    assert response.status_code == 201
+    bank_id = response.get_json()["id"]
+
+    # Primary-key lookup instead of filtering on the (unindexed) name
     with app.app_context():
-        bank = Bank.query.filter_by(name="API Test Bank").first()
+        bank = db.session.get(Bank, bank_id)
         assert bank is not None
+        assert bank.name == "API Test Bank"
+        assert bank.location == "Dhaka"
+
+
+def test_api_create_bank_issues_no_select(client, app):
+    """
+    Creating a bank should not re-read it after commit: the session keeps
+    attributes loaded (expire_on_commit=False), so no SELECT is emitted.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.post("/api/banks", json=CREATE_PAYLOAD)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 201
+    assert any(stmt.lstrip().upper().startswith("INSERT") for stmt in statements)
+    assert not any(stmt.lstrip().upper().startswith("SELECT") for stmt in statements)
 
 
 def test_api_get_bank_detail(client, app):
@@ -121,15 +254,16 @@ def test_api_update_bank(client, app):
         db.session.commit()
         bank_id = bank.id
 
-    payload = {"location": "New City"}
-    response = client.put(f"/api/banks/{bank_id}", json=payload)
+    response = client.put(f"/api/banks/{bank_id}", json=UPDATE_PAYLOAD)
     assert response.status_code == 200
     data = response.get_json()
+    assert data["id"] == bank_id
+    assert data["name"] == "Dhaka Bank"
     assert data["location"] == "New City"
 
-    with app.app_context():
-        updated = db.session.get(Bank, bank_id)
-        assert updated.location == "New City"
+    # The change is committed, not just echoed back
+    response = client.get(f"/api/banks/{bank_id}")
+    assert response.get_json()["location"] == "New City"
 
 
 def test_api_delete_bank(client, app):
@@ -145,23 +279,45 @@ def test_api_delete_bank(client, app):
     response = client.delete(f"/api/banks/{bank_id}")
     assert response.status_code == 204
 
-    with app.app_context():
-        deleted = db.session.get(Bank, bank_id)
-        assert deleted is None
+    # The bank is gone, so fetching it now returns 404
+    response = client.get(f"/api/banks/{bank_id}")
+    assert response.status_code == 404
 
 
-def test_api_create_bank_duplicate(client, app):
+@pytest.fixture(scope="module")
+def dup_bank_responses(app, client):
     """
-    When creating a bank with duplicate name and location, the API should return a
-    JSON 400 error.
+    Seed "Dup Bank" in Dhaka once and send both duplicate requests against
+    it: creating the same bank, and renaming another bank into it.
+
+    Returns the responses keyed by "create" and "update"; the banks are
+    removed again so other tests start from an empty table.
     """
-    # Seed one bank
     with app.app_context():
         db.session.add(Bank(name="Dup Bank", location="Dhaka"))
+        other = Bank(name="Other Bank", location="Chittagong")
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+
+    responses = {
+        "create": client.post("/api/banks", json=DUPLICATE_PAYLOAD),
+        "update": client.put(f"/api/banks/{other_id}", json=DUPLICATE_PAYLOAD),
+    }
+
+    with app.app_context():
+        Bank.query.delete()
         db.session.commit()
 
-    # Try to create duplicate (case-insensitive)
-    resp = client.post("/api/banks", json={"name": "dup bank", "location": "dhaka"})
+    return responses
+
+
+def test_api_create_bank_duplicate(dup_bank_responses):
+    """
+    When creating a bank with duplicate name and location, the API should return a
+    JSON 400 error.
+    """
+    resp = dup_bank_responses["create"]
     assert resp.status_code == 400
 
     data = resp.get_json()
@@ -169,23 +325,12 @@ def test_api_create_bank_duplicate(client, app):
     assert "already exists" in data["message"].lower()
 
 
-def test_api_update_bank_duplicate(client, app):
+def test_api_update_bank_duplicate(dup_bank_responses):
     """
     When updating a bank with duplicate name and location, the API should return a
     JSON 400 error.
     """
-
-    with app.app_context():
-        db.session.add(Bank(name="Bank 1", location="Dhaka"))
-        bank = Bank(name="Bank 2", location="Chittagong")
-        db.session.add(bank)
-        db.session.commit()
-        bank_id = bank.id
-
-    # Try to update bank 2 with bank 1's name and location
-    resp = client.put(
-        f"/api/banks/{bank_id}", json={"name": "bank 1", "location": "dhaka"}
-    )
+    resp = dup_bank_responses["update"]
     assert resp.status_code == 400
 
     data = resp.get_json()
@@ -216,6 +361,27 @@ def test_api_update_same_bank(client, app):
     assert data["location"] == "dhaka"
 
 
+def test_api_patch_bank_duplicate_partial(client, app):
+    """
+    When a partial update collides with another bank's name and location,
+    the database constraint should surface as the same JSON 400 error.
+    """
+
+    with app.app_context():
+        db.session.add(Bank(name="Bank 1", location="Dhaka"))
+        bank = Bank(name="Bank 2", location="Dhaka")
+        db.session.add(bank)
+        db.session.commit()
+        bank_id = bank.id
+
+    # Only the name is sent; the location already matches bank 1
+    resp = client.patch(f"/api/banks/{bank_id}", json={"name": "BANK 1"})
+    assert resp.status_code == 400
+
+    data = resp.get_json()
+    assert data["error"] == "Existing bank"
+
+
 def test_api_404_returns_json(client):
     """
     Requesting a non-existent bank should return a JSON error.
@@ -229,6 +395,46 @@ def test_api_404_returns_json(client):
     assert "Bank with id 9999 not found" in data["message"]
 
 
+def test_api_unknown_route_returns_json(client):
+    """
+    Routing errors under /api/ should also be JSON, while HTML routes keep
+    the default error page.
+    """
+    response = client.get("/api/unknown")
+    assert response.status_code == 404
+    assert response.get_json()["error"] == "Not Found"
+
+    response = client.post("/api/banks/1")
+    assert response.status_code == 405
+    assert response.get_json()["error"] == "Method Not Allowed"
+
+    response = client.get("/unknown")
+    assert response.status_code == 404
+    assert response.is_json is False
+
+
+def test_api_update_missing_bank_returns_404(client):
+    """
+    Updating a non-existent bank should return a JSON 404 error.
+    """
+    response = client.put("/api/banks/9999", json={"name": "Ghost Bank"})
+    assert response.status_code == 404
+
+    data = response.get_json()
+    assert "Bank with id 9999 not found" in data["message"]
+
+
+def test_api_delete_missing_bank_returns_404(client):
+    """
+    Deleting a non-existent bank should return a JSON 404 error.
+    """
+    response = client.delete("/api/banks/9999")
+    assert response.status_code == 404
+
+    data = response.get_json()
+    assert "Bank with id 9999 not found" in data["message"]
+
+
 def test_api_400_on_missing_fields(client):
     """
     When creating a bank with missing fields, the API should return a
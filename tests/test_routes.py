@@ -4,104 +4,178 @@ This covers:
 - listing banks
 - pagination behavior on /banks
 - creating a bank
+- creating a duplicate bank
+- creating a duplicate bank with non-ASCII letters
+- creating a duplicate bank the pre-check misses
 - editing a bank
+- editing a bank into a duplicate
+- editing a bank into a non-ASCII duplicate
+- editing a bank into a duplicate the pre-check misses
 - deleting a bank
 - bank detail page
 """
 
-from app import db
+import re
+
+import pytest
+
+from app import db, routes
 from app.models import Bank
 
+# Matches the bank name cell of each row in the /banks table
+BANK_RE = re.compile(rb">Bank (\d+)<")
+
+
+@pytest.fixture
+def skip_duplicate_precheck(monkeypatch):
+    """
+    Make the form handlers' duplicate pre-check always miss, as it would
+    when another request inserts the same bank concurrently, so the
+    unique constraint is what rejects the duplicate.
+    """
+    monkeypatch.setattr(routes, "_bank_exists", lambda *args, **kwargs: False)
+
+
+def test_get_bank_list_page_empty(empty_responses):
+    """
+    When no banks exist, the /banks page should still render.
+    """
+    assert empty_responses["html"].status_code == 200
+
 
-def test_get_bank_list_page_empty(client):
+def test_get_bank_list_page_empty_message(empty_responses):
     """
     When no banks exist, the /banks page should show a helpful message.
     """
-    response = client.get("/banks")
-    assert response.status_code == 200
+    response = empty_responses["html"]
     assert b"No banks found" in response.data
     assert b"Create one" in response.data
 
 
-def test_bank_list_pagination_first_page_html(client, app):
+@pytest.fixture(scope="module")
+def paginated_pages(app, client, seed_banks):
     """
-    Test that /banks shows only the first page of results when paginated.
+    Seed 12 banks once, render the first two /banks pages, then remove the
+    banks again so other tests start from an empty table.
 
-    We set per_page=5 in the route code.
+    Returns the raw HTML bytes of each page keyed by page number, so every
+    test below only does byte substring checks against a cached page,
+    without decoding the body first.
+    The route uses per_page=5, so 12 banks span three pages.
     """
+    seed_banks(12)
+
+    pages = {}
+    for page in (1, 2):
+        response = client.get(f"/banks?page={page}")
+        assert response.status_code == 200
+        pages[page] = response.data
+
     with app.app_context():
-        # Create 12 banks to force multiple pages
-        for i in range(1, 13):
-            db.session.add(Bank(name=f"Bank {i}", location=f"City {i}"))
+        Bank.query.delete()
         db.session.commit()
 
-    # Request first page
-    response = client.get("/banks?page=1")
-    assert response.status_code == 200
+    return pages
+
+
+@pytest.mark.parametrize(
+    "page,expected",
+    [
+        (1, range(1, 6)),  # Page 1 should contain Bank 1..5
+        (2, range(6, 11)),  # Page 2 should contain Bank 6..10
+    ],
+)
+def test_bank_list_pagination_shows_page_banks(paginated_pages, page, expected):
+    """
+    Test that /banks?page=N shows only the banks of that page, in order.
+    """
+    found = [int(x) for x in BANK_RE.findall(paginated_pages[page])]
+    assert found == list(expected)
+
+
+def test_bank_list_pagination_first_page_current(paginated_pages):
+    """Page 1 should be marked as the current page."""
+    assert b'<span class="current">1</span>' in paginated_pages[1]
 
-    html_text = response.get_data(as_text=True)
 
-    # Page 1 should contain Bank 1..5
-    for i in range(1, 6):
-        assert f">Bank {i}<" in html_text
+def test_bank_list_pagination_second_page_current(paginated_pages):
+    """Page 2 should be marked as the current page."""
+    assert b'<span class="current">2</span>' in paginated_pages[2]
 
-    # But should NOT contain Bank 6+
-    assert ">Bank 6<" not in html_text
-    assert ">Bank 12<" not in html_text
 
-    # Should show pagination controls if more than 1 page
-    assert 'class="pagination"' in html_text
-    # Current page '1' should appear as current
-    assert '<span class="current">1</span>' in html_text
+def test_bank_list_pagination_controls_shown(paginated_pages):
+    """Pagination controls should be shown when there is more than 1 page."""
+    assert b'class="pagination"' in paginated_pages[1]
 
 
-def test_bank_list_pagination_second_page_html(client, app):
+def test_create_bank_via_form(client):
     """
-    Test that /banks?page=2 shows the second page of results.
+    Test creating a bank via the HTML form.
+    """
+    response = client.post(
+        "/banks/create",
+        data={"name": "Test Bank", "location": "Dhaka"},
+        follow_redirects=True,
+    )
+    assert response.status_code == 200
+    assert b"Bank created successfully" in response.data
+    assert b"Test Bank" in response.data
+    assert b"Dhaka" in response.data
+
 
-    We set per_page=5 in the route code.
+def test_create_bank_duplicate_via_form(client, app):
+    """
+    Creating a bank whose name and location match an existing bank
+    (case-insensitively) should re-render the form with an error.
     """
     with app.app_context():
-        for i in range(1, 13):
-            db.session.add(Bank(name=f"Bank {i}", location=f"City {i}"))
+        db.session.add(Bank(name="Dup Bank", location="Dhaka"))
         db.session.commit()
 
-    # Request second page
-    response = client.get("/banks?page=2")
+    response = client.post(
+        "/banks/create",
+        data={"name": "DUP BANK", "location": "dhaka"},
+    )
     assert response.status_code == 200
+    assert b"Another bank with this name and location already exists" in response.data
 
-    html_text = response.get_data(as_text=True)
+    with app.app_context():
+        assert Bank.query.count() == 1
 
-    # Page 2 should contain Bank 6..10
-    for i in range(6, 11):
-        assert f">Bank {i}<" in html_text
 
-    # Should not contain Bank 1..5
-    assert ">Bank 1<" not in html_text
-    assert ">Bank 5<" not in html_text
+def test_create_bank_duplicate_non_ascii_via_form(client):
+    """
+    The pre-check should catch an exact duplicate with non-ASCII letters.
+    """
+    data = {"name": "Ünion Bank", "location": "Dhaka"}
+    response = client.post("/banks/create", data=data)
+    assert response.status_code == 302
 
-    # Check pagination current page 2
-    assert '<span class="current">2</span>' in html_text
+    response = client.post("/banks/create", data=data)
+    assert response.status_code == 200
+    assert b"Another bank with this name and location already exists" in response.data
 
 
-def test_create_bank_via_form(client, app):
+def test_create_bank_duplicate_constraint_via_form(
+    client, app, skip_duplicate_precheck
+):
     """
-    Test creating a bank via the HTML form.
+    A duplicate that gets past the pre-check should be rejected by the
+    unique constraint and re-render the form with the same error.
     """
+    with app.app_context():
+        db.session.add(Bank(name="Dup Bank", location="Dhaka"))
+        db.session.commit()
+
     response = client.post(
         "/banks/create",
-        data={"name": "Test Bank", "location": "Dhaka"},
-        follow_redirects=True,
+        data={"name": "DUP BANK", "location": "dhaka"},
     )
     assert response.status_code == 200
-    assert b"Bank created successfully" in response.data
-    assert b"Test Bank" in response.data
+    assert b"Another bank with this name and location already exists" in response.data
 
-    # Ensure it's saved in the DB also
     with app.app_context():
-        bank = Bank.query.filter_by(name="Test Bank").first()
-        assert bank is not None
-        assert bank.location == "Dhaka"
+        assert Bank.query.count() == 1
 
 
 def test_update_bank_via_form(client, app):
@@ -121,12 +195,80 @@ def test_update_bank_via_form(client, app):
     )
     assert response.status_code == 200
     assert b"Bank updated successfully" in response.data
+    # The redirect lands on the detail page, which shows the saved values
     assert b"Eastern Bank Ltd." in response.data
+    assert b"Chittagong" in response.data
+
 
+def test_update_bank_duplicate_via_form(client, app):
+    """
+    Editing a bank to match another bank's name and location should be
+    rejected, while keeping its own name and location is allowed.
+    """
     with app.app_context():
-        updated = db.session.get(Bank, bank_id)
-        assert updated.name == "Eastern Bank Ltd."
-        assert updated.location == "Chittagong"
+        db.session.add(Bank(name="Bank 1", location="Dhaka"))
+        bank = Bank(name="Bank 2", location="Dhaka")
+        db.session.add(bank)
+        db.session.commit()
+        bank_id = bank.id
+
+    response = client.post(
+        f"/banks/{bank_id}/edit",
+        data={"name": "bank 1", "location": "DHAKA"},
+    )
+    assert b"Another bank with this name and location already exists" in response.data
+
+    response = client.post(
+        f"/banks/{bank_id}/edit",
+        data={"name": "BANK 2", "location": "Dhaka"},
+        follow_redirects=True,
+    )
+    assert b"Bank updated successfully" in response.data
+
+
+def test_update_bank_duplicate_non_ascii_via_form(client, app):
+    """
+    The pre-check should catch an edit into an exact duplicate with
+    non-ASCII letters.
+    """
+    with app.app_context():
+        db.session.add(Bank(name="Ünion Bank", location="Dhaka"))
+        bank = Bank(name="Other Bank", location="Dhaka")
+        db.session.add(bank)
+        db.session.commit()
+        bank_id = bank.id
+
+    response = client.post(
+        f"/banks/{bank_id}/edit",
+        data={"name": "Ünion Bank", "location": "Dhaka"},
+    )
+    assert response.status_code == 200
+    assert b"Another bank with this name and location already exists" in response.data
+
+
+def test_update_bank_duplicate_constraint_via_form(
+    client, app, skip_duplicate_precheck
+):
+    """
+    Editing a bank into a duplicate that gets past the pre-check should be
+    rejected by the unique constraint, leaving the bank unchanged.
+    """
+    with app.app_context():
+        db.session.add(Bank(name="Bank 1", location="Dhaka"))
+        bank = Bank(name="Bank 2", location="Dhaka")
+        db.session.add(bank)
+        db.session.commit()
+        bank_id = bank.id
+
+    response = client.post(
+        f"/banks/{bank_id}/edit",
+        data={"name": "bank 1", "location": "DHAKA"},
+    )
+    assert response.status_code == 200
+    assert b"Another bank with this name and location already exists" in response.data
+
+    with app.app_context():
+        assert db.session.get(Bank, bank_id).name == "Bank 2"
 
 
 def test_delete_bank_via_form(client, app):
@@ -152,9 +294,9 @@ def test_delete_bank_via_form(client, app):
     assert response.status_code == 200
     assert b"Bank deleted successfully" in response.data
 
-    with app.app_context():
-        deleted = db.session.get(Bank, bank_id)
-        assert deleted is None
+    # The bank is gone, so its detail page now returns 404
+    response = client.get(f"/banks/{bank_id}")
+    assert response.status_code == 404
 
 
 def test_bank_detail_page(client, app):